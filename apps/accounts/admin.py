@@ -60,3 +60,4 @@ class SavedAddressAdmin(admin.ModelAdmin):
     list_filter = ('name', 'is_default')
     search_fields = ('customer__phone', 'customer__first_name', 'address')
     raw_id_fields = ('customer',)
+    list_select_related = ('customer',)
@@ -2,35 +2,60 @@
 Custom authentication backend for phone-based login.
 """
 
+from functools import lru_cache
+
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.utils.crypto import get_random_string
 
 Customer = get_user_model()
+USERNAME_FIELD = Customer.USERNAME_FIELD
+
+# Columns loaded for request.user on every authenticated request
+SESSION_USER_FIELDS = (
+    'id', 'password', 'phone', 'first_name', 'last_name', 'email',
+    'bonus_balance', 'is_active', 'is_staff', 'is_superuser', 'last_login',
+)
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash():
+    """
+    Hash of a random password, checked against when the phone is unknown.
+    """
+    return make_password(get_random_string(32))
 
 
 class PhoneBackend(ModelBackend):
     """
     Authentication backend that uses phone number instead of username.
+    Also serves the admin login form, which passes the phone as ``username``.
     """
 
     def authenticate(self, request, phone=None, password=None, **kwargs):
         """
         Authenticate user by phone number and password.
         """
-        if phone is None:
-            phone = kwargs.get(Customer.USERNAME_FIELD)
-
-        if phone is None or password is None:
+        if password is None:
             return None
 
+        if phone is None:
+            phone = kwargs.get('username') or kwargs.get(USERNAME_FIELD)
+            if phone is None:
+                return None
+
         try:
             # Normalize phone number
-            phone = ''.join(filter(lambda x: x.isdigit() or x == '+', phone))
-            user = Customer.objects.get(phone=phone)
+            phone = Customer.objects.normalize_phone(phone)
+            # Only the columns needed to verify credentials and greet the user
+            user = Customer.objects.only(
+                'id', 'phone', 'password', 'is_active', 'first_name'
+            ).get(phone=phone)
         except Customer.DoesNotExist:
-            # Run the default password hasher once to reduce the timing
-            # difference between an existing and a nonexistent user
-            Customer().set_password(password)
+            # Verify against a dummy hash to reduce the timing difference
+            # between an existing and a nonexistent user
+            check_password(password, _dummy_hash())
             return None
 
         if user.check_password(password) and self.user_can_authenticate(user):
@@ -43,6 +68,6 @@ class PhoneBackend(ModelBackend):
         Get user by ID.
         """
         try:
-            return Customer.objects.get(pk=user_id)
+            return Customer.objects.only(*SESSION_USER_FIELDS).get(pk=user_id)
         except Customer.DoesNotExist:
             return None
@@ -86,7 +86,7 @@ class CustomerRegistrationForm(UserCreationForm):
         """Normalize and validate phone number."""
         phone = self.cleaned_data.get('phone')
         # Remove spaces and dashes
-        phone = ''.join(filter(lambda x: x.isdigit() or x == '+', phone))
+        phone = Customer.objects.normalize_phone(phone)
 
         # Check if phone already exists
         if Customer.objects.filter(phone=phone).exists():
@@ -154,7 +154,7 @@ class CustomerLoginForm(forms.Form):
 
         if phone and password:
             # Normalize phone
-            phone = ''.join(filter(lambda x: x.isdigit() or x == '+', phone))
+            phone = Customer.objects.normalize_phone(phone)
 
             self.user_cache = authenticate(
                 self.request,
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:05
+
+from django.db import migrations, models
+
+
+def keep_latest_default(apps, schema_editor):
+    """Leave at most one default address per customer (the newest one)."""
+    SavedAddress = apps.get_model('accounts', 'SavedAddress')
+    seen = set()
+    extra = []
+    defaults = SavedAddress.objects.filter(is_default=True).order_by('customer_id', '-created_at', '-pk')
+    for address in defaults.only('pk', 'customer_id'):
+        if address.customer_id in seen:
+            extra.append(address.pk)
+        seen.add(address.customer_id)
+    SavedAddress.objects.filter(pk__in=extra).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_default, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='savedaddress',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('customer',), name='one_default_address_per_customer'),
+        ),
+    ]
@@ -2,10 +2,15 @@
 Custom user model and related models for Suwi.
 """
 
+import re
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 
+# Everything except digits and the leading plus sign
+_PHONE_STRIP = re.compile(r'[^0-9+]')
+
 
 class CustomerManager(BaseUserManager):
     """
@@ -46,7 +51,7 @@ class CustomerManager(BaseUserManager):
         """
         Normalize phone number by removing spaces and dashes.
         """
-        return ''.join(filter(lambda x: x.isdigit() or x == '+', phone))
+        return _PHONE_STRIP.sub('', phone)
 
 
 class Customer(AbstractUser):
@@ -181,16 +186,30 @@ class SavedAddress(models.Model):
         verbose_name = 'Сохранённый адрес'
         verbose_name_plural = 'Сохранённые адреса'
         ordering = ['-is_default', '-created_at']
+        constraints = [
+            # Partial unique index on customer_id WHERE is_default; it also
+            # serves lookups of a customer's default address
+            models.UniqueConstraint(
+                fields=['customer'],
+                condition=models.Q(is_default=True),
+                name='one_default_address_per_customer',
+            ),
+        ]
 
     def __str__(self):
         display_name = self.custom_name if self.name == 'other' else self.get_name_display()
         return f'{display_name}: {self.address[:50]}'
 
     def save(self, *args, **kwargs):
-        # If this address is set as default, remove default from other addresses
-        if self.is_default:
+        if not self.is_default:
+            super().save(*args, **kwargs)
+            return
+
+        # If this address is set as default, remove default from other addresses.
+        # Both writes share a transaction so the one-default constraint holds.
+        with transaction.atomic():
             SavedAddress.objects.filter(
-                customer=self.customer,
+                customer_id=self.customer_id,
                 is_default=True
             ).exclude(pk=self.pk).update(is_default=False)
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
@@ -1,3 +1,71 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from apps.menu.models import Category, Product
+from apps.orders.models import Order, OrderItem
+
+from .models import Customer
+
+
+# Render templates without a collectstatic manifest
+TEST_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class OrderListQueryTests(TestCase):
+    """
+    Profile and order history must not query per order.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create_user(
+            phone='+998901234567', password='testpass123'
+        )
+        category = Category.objects.create(name='Роллы', slug='rolls')
+        cls.products = [
+            Product.objects.create(
+                category=category, name=f'Ролл {i}', slug=f'roll-{i}', price=30000
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.customer)
+
+    def add_order(self):
+        order = Order.objects.create(
+            customer=self.customer,
+            address='Ташкент, ул. Тестовая, 1',
+            phone=self.customer.phone,
+            latitude='41.311081',
+            longitude='69.240562',
+        )
+        for product in self.products:
+            OrderItem.objects.create(
+                order=order, product=product, product_name=product.name, quantity=2
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, url):
+        self.add_order()
+        single = self.count_queries(url)
+        for _ in range(4):
+            self.add_order()
+        self.assertEqual(self.count_queries(url), single)
+
+    def test_profile(self):
+        self.assert_constant_queries(reverse('accounts:profile'))
+
+    def test_order_history(self):
+        self.assert_constant_queries(reverse('accounts:order_history'))
@@ -10,6 +10,7 @@ from django.views.generic import FormView, UpdateView, TemplateView
 from django.urls import reverse_lazy
 from django.contrib import messages
 
+from apps.orders.models import ORDER_CARD_FIELDS
 from .forms import CustomerRegistrationForm, CustomerLoginForm, CustomerProfileForm
 from .models import Customer
 
@@ -128,7 +129,7 @@ class ProfileView(LoginRequiredMixin, UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Мой профиль'
-        context['orders'] = self.request.user.orders.all()[:5]
+        context['orders'] = self.request.user.orders.only(*ORDER_CARD_FIELDS)[:5]
         return context
 
 
@@ -141,5 +142,7 @@ class OrderHistoryView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'История заказов'
-        context['orders'] = self.request.user.orders.all()
+        context['orders'] = self.request.user.orders.only(
+            *ORDER_CARD_FIELDS
+        ).prefetch_related('items')
         return context
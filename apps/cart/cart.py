@@ -2,10 +2,14 @@
 Shopping cart implementation using Django sessions.
 """
 
-from decimal import Decimal
+import logging
+
 from django.conf import settings
+from django.utils.functional import cached_property
 from apps.menu.models import Product
 
+logger = logging.getLogger(__name__)
+
 
 class Cart:
     """
@@ -15,13 +19,10 @@ class Cart:
     def __init__(self, request):
         """
         Initialize the cart.
+        An empty cart is only written to the session once something is added.
         """
         self.session = request.session
-        cart = self.session.get(settings.CART_SESSION_ID)
-        if not cart:
-            # Save an empty cart in the session
-            cart = self.session[settings.CART_SESSION_ID] = {}
-        self.cart = cart
+        self.cart = self.session.get(settings.CART_SESSION_ID) or {}
 
     def add(self, product, quantity=1, override_quantity=False):
         """
@@ -33,21 +34,29 @@ class Cart:
             override_quantity: If True, replace quantity; if False, add to existing
         """
         product_id = str(product.id)
+        item = self.cart.get(product_id)
+        current = item['quantity'] if item else 0
 
-        if product_id not in self.cart:
-            self.cart[product_id] = {
-                'quantity': 0,
-                'price': str(product.price),
-            }
+        if not override_quantity:
+            quantity += current
 
-        if override_quantity:
-            self.cart[product_id]['quantity'] = quantity
-        else:
-            self.cart[product_id]['quantity'] += quantity
+        # Nothing changed, skip the session write
+        if item is not None and quantity == current:
+            return
 
-        # Remove item if quantity is 0 or less
-        if self.cart[product_id]['quantity'] <= 0:
+        if quantity <= 0:
+            # Remove item if quantity is 0 or less
+            if item is None:
+                return
             del self.cart[product_id]
+        elif item is None:
+            self.cart[product_id] = {
+                'quantity': quantity,
+                # Prices are whole sums (decimal_places=0), kept as int
+                'price': int(product.price),
+            }
+        else:
+            item['quantity'] = quantity
 
         self.save()
 
@@ -55,40 +64,64 @@ class Cart:
         """
         Remove a product from the cart.
         """
-        product_id = str(product.id)
+        self.remove_by_id(product.id)
+
+    def remove_by_id(self, product_id):
+        """
+        Remove a product from the cart by its ID, without loading it.
+        """
+        product_id = str(product_id)
         if product_id in self.cart:
             del self.cart[product_id]
             self.save()
 
     def save(self):
         """
-        Mark the session as modified to make sure it gets saved.
+        Store the cart in the session and mark it as modified.
         """
+        self.session[settings.CART_SESSION_ID] = self.cart
         self.session.modified = True
+        self._reset_cache()
 
     def clear(self):
         """
         Remove cart from session.
         """
-        del self.session[settings.CART_SESSION_ID]
-        self.save()
+        if settings.CART_SESSION_ID in self.session:
+            del self.session[settings.CART_SESSION_ID]
+        self.cart = {}
+        self._reset_cache()
 
-    def __iter__(self):
+    def _reset_cache(self):
         """
-        Iterate over the items in the cart and get the products from the database.
+        Drop values derived from the cart contents after they change.
         """
-        product_ids = self.cart.keys()
-        # Get the product objects and add them to the cart
-        products = Product.objects.filter(id__in=product_ids)
-        cart = self.cart.copy()
+        self.__dict__.pop('_prices', None)
+        self.__dict__.pop('_product_ids', None)
 
-        for product in products:
-            cart[str(product.id)]['product'] = product
-
-        for item in cart.values():
-            item['price'] = Decimal(item['price'])
-            item['total_price'] = item['price'] * item['quantity']
-            yield item
+    def __iter__(self):
+        """
+        Iterate over the items in the cart and get the products from the database.
+        Items are yielded in the order they were added to the cart.
+        """
+        if not self.cart:
+            return
+
+        product_ids = self._product_ids
+        products = Product.objects.in_bulk(product_ids.values())
+
+        for product_id, item in self.cart.items():
+            product = products.get(product_ids[product_id])
+            if product is None:
+                # Product was deleted after being added to the cart
+                continue
+            price = self._prices[product_id]
+            yield {
+                'product': product,
+                'quantity': item['quantity'],
+                'price': price,
+                'total_price': price * item['quantity'],
+            }
 
     def __len__(self):
         """
@@ -96,29 +129,60 @@ class Cart:
         """
         return sum(item['quantity'] for item in self.cart.values())
 
+    @cached_property
+    def _product_ids(self):
+        """
+        Integer primary keys for the string keys stored in the session.
+        """
+        return {product_id: int(product_id) for product_id in self.cart}
+
+    @cached_property
+    def _prices(self):
+        """
+        Item prices as int, parsed once per cart instance.
+        Older sessions may still hold prices as strings.
+        """
+        return {
+            product_id: int(item['price'])
+            for product_id, item in self.cart.items()
+        }
+
     def get_total_price(self):
         """
         Calculate the total cost of all items in the cart.
         """
+        if not self.cart:
+            return 0
+        prices = self._prices
         return sum(
-            Decimal(item['price']) * item['quantity']
-            for item in self.cart.values()
+            prices[product_id] * item['quantity']
+            for product_id, item in self.cart.items()
         )
 
+    def summary(self):
+        """
+        Return (item count, total price) computed in a single pass.
+        """
+        count = 0
+        total = 0
+        prices = self._prices
+        for product_id, item in self.cart.items():
+            quantity = item['quantity']
+            count += quantity
+            total += prices[product_id] * quantity
+        return count, total
+
     def get_item(self, product_id):
         """
         Get a specific item from the cart.
         """
-        product_id = str(product_id)
-        if product_id in self.cart:
-            return self.cart[product_id]
-        return None
+        return self.cart.get(str(product_id))
 
     def get_quantity(self, product_id):
         """
         Get quantity of a specific product in cart.
         """
-        item = self.get_item(product_id)
+        item = self.cart.get(str(product_id))
         return item['quantity'] if item else 0
 
     @property
@@ -128,23 +192,34 @@ class Cart:
         """
         return len(self.cart) == 0
 
-    def to_order_items(self):
+    def to_order_items(self, products=None):
         """
         Convert cart items to order items data.
         Returns list of dicts ready for OrderItem creation.
+
+        Args:
+            products: Optional dict of Product instances keyed by int pk,
+                for callers that already loaded the cart's products
         """
-        product_ids = self.cart.keys()
-        products = Product.objects.filter(id__in=product_ids)
-        products_dict = {str(p.id): p for p in products}
+        if not self.cart:
+            return []
+
+        product_ids = self._product_ids
+        if products is None:
+            products = Product.objects.only('id', 'name', 'price').in_bulk(
+                product_ids.values()
+            )
 
         items = []
         for product_id, item_data in self.cart.items():
-            product = products_dict.get(product_id)
-            if product:
-                items.append({
-                    'product': product,
-                    'product_name': product.name,
-                    'price': product.price,
-                    'quantity': item_data['quantity'],
-                })
+            product = products.get(product_ids[product_id])
+            if product is None:
+                logger.warning(f'Cart product {product_id} no longer exists, skipping')
+                continue
+            items.append({
+                'product': product,
+                'product_name': product.name,
+                'price': product.price,
+                'quantity': item_data['quantity'],
+            })
         return items
@@ -3,10 +3,14 @@ Context processor for cart.
 Makes cart available in all templates.
 """
 
+from django.utils.functional import SimpleLazyObject
+
+from apps.cart.cart import Cart
+
 
 def cart(request):
     """
     Add cart to template context.
+    The cart is only built when a template actually uses it.
     """
-    from apps.cart.cart import Cart
-    return {'cart': Cart(request)}
+    return {'cart': SimpleLazyObject(lambda: Cart(request))}
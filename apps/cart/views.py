@@ -11,6 +11,9 @@ from django.utils.decorators import method_decorator
 from apps.menu.models import Product
 from .cart import Cart
 
+# Columns the cart needs from a product: its id, the price and the name
+CART_PRODUCT_FIELDS = ('id', 'name', 'price', 'is_available')
+
 
 class CartDetailView(TemplateView):
     """
@@ -24,14 +27,36 @@ class CartDetailView(TemplateView):
         return context
 
 
-class CartAddView(View):
+class AjaxCartMixin:
+    """
+    Shared helpers for cart views that answer AJAX requests with JSON.
+    """
+
+    def is_ajax(self):
+        return self.request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+    def cart_response(self, cart, **extra):
+        """Return the cart count and total as JSON, plus any extra fields."""
+        cart_count, cart_total = cart.summary()
+        return JsonResponse({
+            'cart_count': cart_count,
+            'cart_total': float(cart_total),
+            **extra,
+        })
+
+
+class CartAddView(AjaxCartMixin, View):
     """
     Add product to cart (AJAX).
     """
 
     def post(self, request, product_id):
         cart = Cart(request)
-        product = get_object_or_404(Product, pk=product_id, is_available=True)
+        product = get_object_or_404(
+            Product.objects.only(*CART_PRODUCT_FIELDS),
+            pk=product_id,
+            is_available=True
+        )
 
         # Get quantity from request
         try:
@@ -49,25 +74,23 @@ class CartAddView(View):
         cart.add(product=product, quantity=quantity, override_quantity=override)
 
         # Check if AJAX request
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            return JsonResponse({
-                'success': True,
-                'cart_count': len(cart),
-                'cart_total': float(cart.get_total_price()),
-                'message': f'{product.name} добавлен в корзину',
-            })
+        if self.is_ajax():
+            return self.cart_response(
+                cart,
+                success=True,
+                message=f'{product.name} добавлен в корзину',
+            )
 
         return redirect('cart:detail')
 
 
-class CartUpdateView(View):
+class CartUpdateView(AjaxCartMixin, View):
     """
     Update product quantity in cart (AJAX).
     """
 
     def post(self, request, product_id):
         cart = Cart(request)
-        product = get_object_or_404(Product, pk=product_id)
 
         try:
             quantity = int(request.POST.get('quantity', 1))
@@ -75,49 +98,49 @@ class CartUpdateView(View):
             quantity = 1
 
         if quantity > 0:
+            product = get_object_or_404(
+                Product.objects.only(*CART_PRODUCT_FIELDS),
+                pk=product_id
+            )
             cart.add(product=product, quantity=quantity, override_quantity=True)
         else:
-            cart.remove(product)
+            cart.remove_by_id(product_id)
 
         # Calculate item total
         item = cart.get_item(product_id)
         item_total = float(item['price']) * item['quantity'] if item else 0
 
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            return JsonResponse({
-                'success': True,
-                'cart_count': len(cart),
-                'cart_total': float(cart.get_total_price()),
-                'item_total': item_total,
-                'quantity': quantity if quantity > 0 else 0,
-            })
+        if self.is_ajax():
+            return self.cart_response(
+                cart,
+                success=True,
+                item_total=item_total,
+                quantity=quantity if quantity > 0 else 0,
+            )
 
         return redirect('cart:detail')
 
 
-class CartRemoveView(View):
+class CartRemoveView(AjaxCartMixin, View):
     """
     Remove product from cart (AJAX).
     """
 
     def post(self, request, product_id):
         cart = Cart(request)
-        product = get_object_or_404(Product, pk=product_id)
+        cart.remove_by_id(product_id)
 
-        cart.remove(product)
-
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            return JsonResponse({
-                'success': True,
-                'cart_count': len(cart),
-                'cart_total': float(cart.get_total_price()),
-                'message': 'Товар удалён из корзины',
-            })
+        if self.is_ajax():
+            return self.cart_response(
+                cart,
+                success=True,
+                message='Товар удалён из корзины',
+            )
 
         return redirect('cart:detail')
 
 
-class CartClearView(View):
+class CartClearView(AjaxCartMixin, View):
     """
     Clear entire cart.
     """
@@ -126,7 +149,7 @@ class CartClearView(View):
         cart = Cart(request)
         cart.clear()
 
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        if self.is_ajax():
             return JsonResponse({
                 'success': True,
                 'cart_count': 0,
@@ -137,15 +160,11 @@ class CartClearView(View):
         return redirect('cart:detail')
 
 
-class CartCountView(View):
+class CartCountView(AjaxCartMixin, View):
     """
     Get cart count and total (AJAX).
     Used for updating cart badge without page reload.
     """
 
     def get(self, request):
-        cart = Cart(request)
-        return JsonResponse({
-            'cart_count': len(cart),
-            'cart_total': float(cart.get_total_price()),
-        })
+        return self.cart_response(Cart(request))
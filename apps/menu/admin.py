@@ -3,10 +3,18 @@ Admin configuration for menu app.
 """
 
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 
 from .models import Category, Product, Favorite
 
+IMAGE_PREVIEW_HTML = '<img src="{}" style="max-height: 50px; max-width: 80px; object-fit: cover;">'
+IMAGE_PREVIEW_LARGE_HTML = '<img src="{}" style="max-height: 200px; max-width: 300px;">'
+
+
+def _sum(value):
+    return f'{value:,.0f} сум'
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -19,9 +27,15 @@ class CategoryAdmin(admin.ModelAdmin):
     ordering = ('order', 'name')
     list_editable = ('order', 'is_active')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _products_count=Count('products')
+        )
+
     def products_count(self, obj):
-        return obj.products.count()
+        return obj._products_count
     products_count.short_description = 'Товаров'
+    products_count.admin_order_field = '_products_count'
 
 
 @admin.register(Product)
@@ -59,25 +73,19 @@ class ProductAdmin(admin.ModelAdmin):
     )
 
     def price_display(self, obj):
-        return f'{obj.price:,.0f} сум'
+        return _sum(obj.price)
     price_display.short_description = 'Цена'
     price_display.admin_order_field = 'price'
 
     def image_preview(self, obj):
         if obj.image:
-            return format_html(
-                '<img src="{}" style="max-height: 50px; max-width: 80px; object-fit: cover;">',
-                obj.image.url
-            )
+            return format_html(IMAGE_PREVIEW_HTML, obj.image.url)
         return '-'
     image_preview.short_description = 'Фото'
 
     def image_preview_large(self, obj):
         if obj.image:
-            return format_html(
-                '<img src="{}" style="max-height: 200px; max-width: 300px;">',
-                obj.image.url
-            )
+            return format_html(IMAGE_PREVIEW_LARGE_HTML, obj.image.url)
         return 'Нет изображения'
     image_preview_large.short_description = 'Превью'
 
@@ -0,0 +1,61 @@
+"""
+Cached menu querysets for Suwi.
+Entries are dropped by the signal handlers in signals.py.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category, Product
+
+# The default LocMem cache is per worker: a signal only clears the worker
+# that handled the save, so without a shared backend entries must expire
+# on their own within seconds
+SHARED_CACHE = 'locmem' not in settings.CACHES['default']['BACKEND'].lower()
+
+POPULAR_PRODUCTS_CACHE_KEY = 'menu:popular_products'
+POPULAR_PRODUCTS_TIMEOUT = 600 if SHARED_CACHE else 5
+
+ACTIVE_CATEGORIES_CACHE_KEY = 'menu:active_categories'
+ACTIVE_CATEGORIES_TIMEOUT = 300 if SHARED_CACHE else 5
+
+# Product columns rendered by menu/includes/product_card.html
+PRODUCT_CARD_FIELDS = (
+    'id', 'category_id', 'name', 'slug', 'description', 'price', 'image',
+    'weight', 'pieces', 'is_available', 'is_new',
+)
+
+
+def get_popular_products():
+    """
+    Return popular products shown at the top of the catalog.
+    """
+    products = cache.get(POPULAR_PRODUCTS_CACHE_KEY)
+    if products is None:
+        products = list(
+            Product.objects.filter(
+                is_available=True,
+                is_popular=True
+            ).only(*PRODUCT_CARD_FIELDS)[:8]
+        )
+        cache.set(POPULAR_PRODUCTS_CACHE_KEY, products, POPULAR_PRODUCTS_TIMEOUT)
+    return products
+
+
+def invalidate_popular_products():
+    cache.delete(POPULAR_PRODUCTS_CACHE_KEY)
+
+
+def get_active_categories():
+    """
+    Return active categories in display order.
+    """
+    categories = cache.get(ACTIVE_CATEGORIES_CACHE_KEY)
+    if categories is None:
+        categories = list(Category.objects.filter(is_active=True))
+        cache.set(ACTIVE_CATEGORIES_CACHE_KEY, categories, ACTIVE_CATEGORIES_TIMEOUT)
+    return categories
+
+
+def invalidate_active_categories():
+    cache.delete(ACTIVE_CATEGORIES_CACHE_KEY)
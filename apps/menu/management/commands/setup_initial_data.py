@@ -51,21 +51,34 @@ class Command(BaseCommand):
             {'name': 'Напитки', 'slug': 'drinks', 'order': 4},
         ]
 
+        existing = set(
+            Category.objects.filter(
+                slug__in=[cat_data['slug'] for cat_data in categories]
+            ).values_list('slug', flat=True)
+        )
+
+        Category.objects.bulk_create(
+            [
+                Category(
+                    name=cat_data['name'],
+                    slug=cat_data['slug'],
+                    order=cat_data['order'],
+                    is_active=True,
+                )
+                for cat_data in categories
+                if cat_data['slug'] not in existing
+            ],
+            ignore_conflicts=True,
+        )
+
         for cat_data in categories:
-            cat, created = Category.objects.get_or_create(
-                slug=cat_data['slug'],
-                defaults={
-                    'name': cat_data['name'],
-                    'order': cat_data['order'],
-                    'is_active': True,
-                }
-            )
-            status = 'created' if created else 'exists'
-            self.stdout.write(f"Category {cat.name}: {status}")
+            status = 'exists' if cat_data['slug'] in existing else 'created'
+            self.stdout.write(f"Category {cat_data['name']}: {status}")
 
     def create_products(self):
-        rolls = Category.objects.get(slug='rolls')
-        sushi = Category.objects.get(slug='sushi')
+        categories = Category.objects.in_bulk(['rolls', 'sushi'], field_name='slug')
+        rolls = categories['rolls']
+        sushi = categories['sushi']
 
         products = [
             # Роллы
@@ -165,22 +178,35 @@ class Command(BaseCommand):
             },
         ]
 
+        existing = set(
+            Product.objects.filter(
+                slug__in=[prod_data['slug'] for prod_data in products]
+            ).values_list('slug', flat=True)
+        )
+
+        Product.objects.bulk_create(
+            [
+                Product(
+                    category=prod_data['category'],
+                    name=prod_data['name'],
+                    slug=prod_data['slug'],
+                    description=prod_data['description'],
+                    price=prod_data['price'],
+                    weight=prod_data.get('weight', ''),
+                    pieces=prod_data.get('pieces', 0),
+                    is_available=True,
+                    is_popular=prod_data.get('is_popular', False),
+                )
+                for prod_data in products
+                if prod_data['slug'] not in existing
+            ],
+            ignore_conflicts=True,
+            batch_size=500,
+        )
+
         for prod_data in products:
-            prod, created = Product.objects.get_or_create(
-                slug=prod_data['slug'],
-                defaults={
-                    'category': prod_data['category'],
-                    'name': prod_data['name'],
-                    'description': prod_data['description'],
-                    'price': prod_data['price'],
-                    'weight': prod_data.get('weight', ''),
-                    'pieces': prod_data.get('pieces', 0),
-                    'is_available': True,
-                    'is_popular': prod_data.get('is_popular', False),
-                }
-            )
-            status = 'created' if created else 'exists'
-            self.stdout.write(f"Product {prod.name}: {status}")
+            status = 'exists' if prod_data['slug'] in existing else 'created'
+            self.stdout.write(f"Product {prod_data['name']}: {status}")
 
     def setup_telegram(self):
         settings, created = TelegramSettings.objects.get_or_create(
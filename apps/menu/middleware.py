@@ -0,0 +1,38 @@
+"""
+Menu middleware for Suwi.
+"""
+
+from django.utils.functional import SimpleLazyObject
+
+from .models import Favorite
+
+
+def get_favorite_ids(request):
+    """
+    Return IDs of the products the current user has favorited.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return frozenset()
+
+    return frozenset(
+        Favorite.objects.filter(
+            customer=user
+        ).values_list('product_id', flat=True)
+    )
+
+
+class FavoriteIdsMiddleware:
+    """
+    Attach lazily loaded `request.favorite_ids` so the Favorite query
+    runs at most once per request, and only if something reads it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.favorite_ids = SimpleLazyObject(
+            lambda: get_favorite_ids(request)
+        )
+        return self.get_response(request)
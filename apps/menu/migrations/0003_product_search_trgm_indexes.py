@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:12
+
+from django.db import migrations
+
+# SearchView filters with name__icontains / description__icontains, which
+# PostgreSQL runs as UPPER(column) LIKE '%...%'. Trigram indexes on the same
+# expressions let those lookups use an index instead of a sequential scan.
+# SQLite (development) has no equivalent, so this is a no-op there.
+
+CREATE_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS prod_name_trgm ON menu_product '
+    'USING gin (UPPER(name::text) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS prod_description_trgm ON menu_product '
+    'USING gin (UPPER(description::text) gin_trgm_ops)',
+]
+
+DROP_SQL = [
+    'DROP INDEX IF EXISTS prod_name_trgm',
+    'DROP INDEX IF EXISTS prod_description_trgm',
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0002_product_category_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgresql(CREATE_SQL), run_on_postgresql(DROP_SQL)),
+    ]
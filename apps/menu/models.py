@@ -57,6 +57,9 @@ class Category(models.Model):
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['is_active', 'order'], name='cat_active_order'),
+        ]
 
     def __str__(self):
         return self.name
@@ -165,6 +168,12 @@ class Product(models.Model):
         verbose_name = 'Продукт'
         verbose_name_plural = 'Продукты'
         ordering = ['category', 'order', 'name']
+        indexes = [
+            # Category pages: available products of a category in display order
+            models.Index(fields=['category', 'is_available', 'order'], name='prod_cat_avail_order'),
+            # Popular products block
+            models.Index(fields=['is_available', 'is_popular'], name='prod_avail_popular'),
+        ]
 
     def __str__(self):
         return self.name
@@ -182,14 +191,16 @@ class Favorite(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='favorites',
-        verbose_name='Клиент'
+        verbose_name='Клиент',
+        db_index=False  # covered by the unique (customer, product) index
     )
 
     product = models.ForeignKey(
         Product,
         on_delete=models.CASCADE,
         related_name='favorited_by',
-        verbose_name='Продукт'
+        verbose_name='Продукт',
+        db_index=False  # covered by the (product, customer) index
     )
 
     created_at = models.DateTimeField(
@@ -200,8 +211,14 @@ class Favorite(models.Model):
     class Meta:
         verbose_name = 'Избранное'
         verbose_name_plural = 'Избранное'
-        unique_together = ['customer', 'product']
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['customer', 'product'], name='fav_customer_product'),
+        ]
+        indexes = [
+            # Reverse lookups: who favorited a product
+            models.Index(fields=['product', 'customer'], name='fav_product_customer'),
+        ]
 
     def __str__(self):
         return f'{self.customer} - {self.product}'
@@ -0,0 +1,23 @@
+"""
+Signal handlers for menu app.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_active_categories, invalidate_popular_products
+from .models import Category, Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, **kwargs):
+    """Drop cached popular products when any product changes."""
+    invalidate_popular_products()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    """Drop cached active categories when any category changes."""
+    invalidate_active_categories()
@@ -2,17 +2,28 @@
 Menu views for Suwi - catalog, categories, products, favorites.
 """
 
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, redirect
 from django.views.generic import ListView, DetailView, View
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Prefetch, Q
 
+from .cache import PRODUCT_CARD_FIELDS, get_active_categories, get_popular_products
 from .models import Category, Product, Favorite
 
 
-class CatalogView(ListView):
+class FavoriteIdsMixin:
+    """
+    Provides the IDs of the current user's favorite products.
+    The set is loaded once per request by FavoriteIdsMiddleware.
+    """
+
+    def get_favorite_ids(self):
+        return self.request.favorite_ids
+
+
+class CatalogView(FavoriteIdsMixin, ListView):
     """
     Main catalog view - shows all categories with products.
     """
@@ -21,31 +32,25 @@ class CatalogView(ListView):
 
     def get_queryset(self):
         return Category.objects.filter(is_active=True).prefetch_related(
-            'products'
+            Prefetch(
+                'products',
+                queryset=Product.objects.filter(
+                    is_available=True
+                ).only(*PRODUCT_CARD_FIELDS)
+            )
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Меню'
-        context['popular_products'] = Product.objects.filter(
-            is_available=True,
-            is_popular=True
-        )[:8]
+        context['popular_products'] = get_popular_products()
 
-        # Get user's favorites if authenticated
-        if self.request.user.is_authenticated:
-            context['favorite_ids'] = set(
-                Favorite.objects.filter(
-                    customer=self.request.user
-                ).values_list('product_id', flat=True)
-            )
-        else:
-            context['favorite_ids'] = set()
+        context['favorite_ids'] = self.get_favorite_ids()
 
         return context
 
 
-class CategoryView(ListView):
+class CategoryView(FavoriteIdsMixin, ListView):
     """
     Category view - shows products in a specific category.
     """
@@ -53,31 +58,25 @@ class CategoryView(ListView):
     context_object_name = 'products'
 
     def get_queryset(self):
-        self.category = get_object_or_404(
-            Category,
-            slug=self.kwargs['slug'],
-            is_active=True
+        self.categories = get_active_categories()
+        self.category = next(
+            (c for c in self.categories if c.slug == self.kwargs['slug']),
+            None
         )
+        if self.category is None:
+            raise Http404('Категория не найдена')
         return Product.objects.filter(
             category=self.category,
             is_available=True
-        )
+        ).only(*PRODUCT_CARD_FIELDS)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
         context['title'] = self.category.name
-        context['categories'] = Category.objects.filter(is_active=True)
+        context['categories'] = self.categories
 
-        # Get user's favorites
-        if self.request.user.is_authenticated:
-            context['favorite_ids'] = set(
-                Favorite.objects.filter(
-                    customer=self.request.user
-                ).values_list('product_id', flat=True)
-            )
-        else:
-            context['favorite_ids'] = set()
+        context['favorite_ids'] = self.get_favorite_ids()
 
         return context
 
@@ -91,7 +90,17 @@ class ProductDetailView(DetailView):
     context_object_name = 'product'
 
     def get_queryset(self):
-        return Product.objects.filter(is_available=True)
+        queryset = Product.objects.filter(is_available=True)
+        if self.request.user.is_authenticated:
+            queryset = queryset.annotate(
+                is_favorite=Exists(
+                    Favorite.objects.filter(
+                        customer=self.request.user,
+                        product=OuterRef('pk')
+                    )
+                )
+            )
+        return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -101,21 +110,15 @@ class ProductDetailView(DetailView):
         context['related_products'] = Product.objects.filter(
             category=self.object.category,
             is_available=True
-        ).exclude(pk=self.object.pk)[:4]
+        ).exclude(pk=self.object.pk).only(*PRODUCT_CARD_FIELDS)[:4]
 
         # Check if in favorites
-        if self.request.user.is_authenticated:
-            context['is_favorite'] = Favorite.objects.filter(
-                customer=self.request.user,
-                product=self.object
-            ).exists()
-        else:
-            context['is_favorite'] = False
+        context['is_favorite'] = getattr(self.object, 'is_favorite', False)
 
         return context
 
 
-class SearchView(ListView):
+class SearchView(FavoriteIdsMixin, ListView):
     """
     Product search view.
     """
@@ -129,7 +132,7 @@ class SearchView(ListView):
                 Q(name__icontains=query) |
                 Q(description__icontains=query),
                 is_available=True
-            )
+            ).only(*PRODUCT_CARD_FIELDS)
         return Product.objects.none()
 
     def get_context_data(self, **kwargs):
@@ -137,14 +140,7 @@ class SearchView(ListView):
         context['query'] = self.request.GET.get('q', '')
         context['title'] = f'Поиск: {context["query"]}'
 
-        if self.request.user.is_authenticated:
-            context['favorite_ids'] = set(
-                Favorite.objects.filter(
-                    customer=self.request.user
-                ).values_list('product_id', flat=True)
-            )
-        else:
-            context['favorite_ids'] = set()
+        context['favorite_ids'] = self.get_favorite_ids()
 
         return context
 
@@ -155,11 +151,18 @@ class FavoritesView(LoginRequiredMixin, ListView):
     """
     template_name = 'menu/favorites.html'
     context_object_name = 'favorites'
+    paginate_by = 24
 
     def get_queryset(self):
         return Favorite.objects.filter(
             customer=self.request.user
-        ).select_related('product', 'product__category')
+        ).select_related('product', 'product__category').only(
+            # Columns rendered by menu/favorites.html
+            'id', 'created_at', 'product_id',
+            'product__id', 'product__category_id', 'product__name',
+            'product__slug', 'product__price', 'product__image',
+            'product__category__id', 'product__category__name',
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -173,18 +176,22 @@ class ToggleFavoriteView(LoginRequiredMixin, View):
     """
 
     def post(self, request, product_id):
-        product = get_object_or_404(Product, pk=product_id, is_available=True)
-
-        favorite, created = Favorite.objects.get_or_create(
+        # Removing is a single DELETE; only adding needs the product check
+        deleted, _ = Favorite.objects.filter(
             customer=request.user,
-            product=product
-        )
+            product_id=product_id
+        ).delete()
 
-        if not created:
-            # Already exists, remove it
-            favorite.delete()
+        if deleted:
             is_favorite = False
         else:
+            if not Product.objects.filter(pk=product_id, is_available=True).exists():
+                raise Http404('Продукт не найден')
+            # ignore_conflicts keeps a concurrent double-click from failing
+            Favorite.objects.bulk_create(
+                [Favorite(customer=request.user, product_id=product_id)],
+                ignore_conflicts=True
+            )
             is_favorite = True
 
         # Check if AJAX request
@@ -3,12 +3,48 @@ Admin configuration for orders app.
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.functions import Substr
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.urls import reverse
 
 from .models import Order, OrderItem
 
 
+def _sum(value):
+    """Format an amount in UZS for admin lists."""
+    return f'{value:,.0f} сум'
+
+
+class EstimatePaginator(Paginator):
+    """
+    Paginator that reads the row count of an unfiltered PostgreSQL table
+    from planner statistics instead of running COUNT(*) over it.
+    """
+
+    # Below this size the exact count is cheap and worth showing
+    exact_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[self.object_list.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                        [self.object_list.model._meta.db_table]
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] > self.exact_threshold:
+                    return row[0]
+        return super().count
+
+
 class OrderItemInline(admin.TabularInline):
     """Inline for order items."""
     model = OrderItem
@@ -17,10 +53,17 @@ class OrderItemInline(admin.TabularInline):
     can_delete = False
 
     def get_total(self, obj):
-        return f'{obj.get_total():,.0f} сум'
+        return _sum(obj.get_total())
     get_total.short_description = 'Сумма'
 
 
+class OrderChangeList(ChangeList):
+    """Order changelist that leaves the full address out of list rows."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        return super().get_queryset(request, *args, **kwargs).defer('address')
+
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     """Admin for Order model."""
@@ -38,6 +81,9 @@ class OrderAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
     inlines = [OrderItemInline]
+    list_select_related = ('customer',)
+    paginator = EstimatePaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('Заказ', {
@@ -61,6 +107,16 @@ class OrderAdmin(admin.ModelAdmin):
 
     actions = ['mark_confirmed', 'mark_cooking', 'mark_delivering', 'mark_delivered']
 
+    def get_queryset(self, request):
+        # The list shows at most 50 characters of the address; the 51st
+        # only tells address_short whether to add an ellipsis
+        return super().get_queryset(request).annotate(
+            _address_short=Substr('address', 1, 51)
+        )
+
+    def get_changelist(self, request, **kwargs):
+        return OrderChangeList
+
     def customer_link(self, obj):
         url = reverse('admin:accounts_customer_change', args=[obj.customer.pk])
         return format_html('<a href="{}">{}</a>', url, obj.customer.phone)
@@ -84,11 +140,12 @@ class OrderAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Статус'
 
     def address_short(self, obj):
-        return obj.address[:50] + '...' if len(obj.address) > 50 else obj.address
+        address = obj._address_short
+        return address[:50] + '...' if len(address) > 50 else address
     address_short.short_description = 'Адрес'
 
     def total_display(self, obj):
-        return f'{obj.total:,.0f} сум'
+        return _sum(obj.total)
     total_display.short_description = 'Итого'
     total_display.admin_order_field = 'total'
 
@@ -105,21 +162,19 @@ class OrderAdmin(admin.ModelAdmin):
 
     @admin.action(description='Пометить как "Подтверждён"')
     def mark_confirmed(self, request, queryset):
-        from django.utils import timezone
-        queryset.update(status='confirmed', confirmed_at=timezone.now())
+        queryset.set_status('confirmed')
 
     @admin.action(description='Пометить как "Готовится"')
     def mark_cooking(self, request, queryset):
-        queryset.update(status='cooking')
+        queryset.set_status('cooking')
 
     @admin.action(description='Пометить как "В доставке"')
     def mark_delivering(self, request, queryset):
-        queryset.update(status='delivering')
+        queryset.set_status('delivering')
 
     @admin.action(description='Пометить как "Доставлен"')
     def mark_delivered(self, request, queryset):
-        from django.utils import timezone
-        queryset.update(status='delivered', delivered_at=timezone.now())
+        queryset.set_status('delivered')
 
 
 @admin.register(OrderItem)
@@ -130,6 +185,9 @@ class OrderItemAdmin(admin.ModelAdmin):
     list_filter = ('order__status',)
     search_fields = ('order__id', 'product_name')
     raw_id_fields = ('order', 'product')
+    list_select_related = ('order',)
+    paginator = EstimatePaginator
+    show_full_result_count = False
 
     def order_link(self, obj):
         url = reverse('admin:orders_order_change', args=[obj.order.pk])
@@ -137,5 +195,5 @@ class OrderItemAdmin(admin.ModelAdmin):
     order_link.short_description = 'Заказ'
 
     def total_display(self, obj):
-        return f'{obj.get_total():,.0f} сум'
+        return _sum(obj.get_total())
     total_display.short_description = 'Сумма'
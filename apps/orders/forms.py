@@ -0,0 +1,63 @@
+"""
+Order forms for Suwi.
+"""
+
+from decimal import Decimal
+
+from django import forms
+
+COORDINATE_PRECISION = Decimal('0.000001')
+
+COORDINATE_ERRORS = {
+    'required': 'Пожалуйста, укажите точку доставки на карте',
+    'invalid': 'Неверные координаты',
+    'min_value': 'Неверные координаты',
+    'max_value': 'Неверные координаты',
+}
+
+
+class CheckoutForm(forms.Form):
+    """
+    Validates the checkout POST. The page renders its own inputs,
+    so this form is only used for cleaning.
+    """
+
+    latitude = forms.DecimalField(
+        min_value=-90,
+        max_value=90,
+        error_messages=COORDINATE_ERRORS
+    )
+
+    longitude = forms.DecimalField(
+        min_value=-180,
+        max_value=180,
+        error_messages=COORDINATE_ERRORS
+    )
+
+    address = forms.CharField(
+        error_messages={'required': 'Укажите адрес доставки'}
+    )
+
+    phone = forms.CharField(
+        max_length=20,
+        error_messages={'required': 'Укажите номер телефона'}
+    )
+
+    comment = forms.CharField(required=False)
+
+    save_address = forms.BooleanField(required=False)
+
+    address_name = forms.CharField(required=False, max_length=50)
+
+    # The map sends full float precision; the models store 6 places
+    def clean_latitude(self):
+        return self.cleaned_data['latitude'].quantize(COORDINATE_PRECISION)
+
+    def clean_longitude(self):
+        return self.cleaned_data['longitude'].quantize(COORDINATE_PRECISION)
+
+    def error_messages_list(self):
+        """Return unique error messages in field order."""
+        return list(dict.fromkeys(
+            error for errors in self.errors.values() for error in errors
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_customer_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='bonus_used',
+            field=models.BigIntegerField(default=0, verbose_name='Использовано бонусов'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='delivery_fee',
+            field=models.BigIntegerField(default=0, verbose_name='Стоимость доставки'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='subtotal',
+            field=models.BigIntegerField(default=0, verbose_name='Сумма товаров'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='total',
+            field=models.BigIntegerField(default=0, verbose_name='Итого к оплате'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='price',
+            field=models.BigIntegerField(help_text='Цена на момент заказа', verbose_name='Цена за единицу'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:05
+
+from django.db import migrations, models
+
+
+def blank_to_null(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    Order.objects.filter(telegram_message_id='').update(telegram_message_id=None)
+
+
+def null_to_blank(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    Order.objects.filter(telegram_message_id=None).update(telegram_message_id='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_integer_amounts'),
+    ]
+
+    operations = [
+        # Empty strings cannot be cast to bigint, clear them first
+        migrations.AlterField(
+            model_name='order',
+            name='telegram_message_id',
+            field=models.CharField(blank=True, help_text='ID сообщения для обновления статуса', max_length=50, null=True, verbose_name='ID сообщения в Telegram'),
+        ),
+        migrations.RunPython(blank_to_null, null_to_blank),
+        migrations.AlterField(
+            model_name='order',
+            name='telegram_message_id',
+            field=models.BigIntegerField(blank=True, help_text='ID сообщения для обновления статуса', null=True, verbose_name='ID сообщения в Telegram'),
+        ),
+    ]
@@ -3,9 +3,42 @@ Order models for Suwi - orders and order items.
 """
 
 from django.db import models
+from django.db.models import F, Sum
 from django.conf import settings
 from django.urls import reverse
-from decimal import Decimal
+from django.utils import timezone
+from functools import lru_cache
+
+
+# Order columns shown on order history cards (orders and profile pages)
+ORDER_CARD_FIELDS = ('id', 'customer_id', 'status', 'total', 'created_at')
+
+
+@lru_cache(maxsize=1)
+def _yandex_go_route_prefix():
+    """Yandex Go route link starting at the restaurant."""
+    return (
+        f'https://3.redirect.appmetrica.yandex.com/route?'
+        f'start-lat={settings.RESTAURANT_LATITUDE}'
+        f'&start-lon={settings.RESTAURANT_LONGITUDE}'
+    )
+
+
+class OrderQuerySet(models.QuerySet):
+
+    def set_status(self, status):
+        """
+        Move all orders in the queryset to a status with one UPDATE.
+        Also stamps updated_at, which update() skips, and the matching
+        confirmed_at/delivered_at timestamp.
+        """
+        now = timezone.now()
+        fields = {'status': status, 'updated_at': now}
+        if status == 'confirmed':
+            fields['confirmed_at'] = now
+        elif status == 'delivered':
+            fields['delivered_at'] = now
+        return self.update(**fields)
 
 
 class Order(models.Model):
@@ -21,13 +54,17 @@ class Order(models.Model):
         ('delivered', 'Доставлен'),
         ('cancelled', 'Отменён'),
     ]
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
+
+    objects = OrderQuerySet.as_manager()
 
     # Customer info
     customer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='orders',
-        verbose_name='Клиент'
+        verbose_name='Клиент',
+        db_index=False  # covered by the (customer, -created_at) index
     )
 
     # Order status
@@ -70,39 +107,31 @@ class Order(models.Model):
         help_text='Пожелания по доставке, аллергии и т.д.'
     )
 
-    # Totals
-    subtotal = models.DecimalField(
+    # Totals (whole UZS, stored as integers)
+    subtotal = models.BigIntegerField(
         'Сумма товаров',
-        max_digits=12,
-        decimal_places=0,
         default=0
     )
 
-    delivery_fee = models.DecimalField(
+    delivery_fee = models.BigIntegerField(
         'Стоимость доставки',
-        max_digits=10,
-        decimal_places=0,
         default=0
     )
 
-    bonus_used = models.DecimalField(
+    bonus_used = models.BigIntegerField(
         'Использовано бонусов',
-        max_digits=10,
-        decimal_places=0,
         default=0
     )
 
-    total = models.DecimalField(
+    total = models.BigIntegerField(
         'Итого к оплате',
-        max_digits=12,
-        decimal_places=0,
         default=0
     )
 
     # Telegram message ID (for updating status in chat)
-    telegram_message_id = models.CharField(
+    telegram_message_id = models.BigIntegerField(
         'ID сообщения в Telegram',
-        max_length=50,
+        null=True,
         blank=True,
         help_text='ID сообщения для обновления статуса'
     )
@@ -135,10 +164,18 @@ class Order(models.Model):
         verbose_name = 'Заказ'
         verbose_name_plural = 'Заказы'
         ordering = ['-created_at']
+        indexes = [
+            # Order history: a customer's orders, newest first
+            models.Index(fields=['customer', '-created_at'], name='order_customer_created'),
+        ]
 
     def __str__(self):
         return f'Заказ #{self.pk} - {self.get_status_display()}'
 
+    def get_status_display(self):
+        # Plain dict lookup instead of Django's generated choices lookup
+        return self.STATUS_DISPLAY.get(self.status, self.status)
+
     def get_absolute_url(self):
         return reverse('orders:detail', kwargs={'pk': self.pk})
 
@@ -155,29 +192,43 @@ class Order(models.Model):
         Return Yandex Go deep link for delivery.
         Pre-fills route from restaurant to customer.
         """
-        restaurant_lat = settings.RESTAURANT_LATITUDE
-        restaurant_lon = settings.RESTAURANT_LONGITUDE
-
         return (
-            f'https://3.redirect.appmetrica.yandex.com/route?'
-            f'start-lat={restaurant_lat}&start-lon={restaurant_lon}'
+            f'{_yandex_go_route_prefix()}'
             f'&end-lat={self.latitude}&end-lon={self.longitude}'
             f'&tariffClass=express'
             f'&comment=Заказ #{self.pk}, тел: {self.phone}'
         )
 
+    def _items_prefetched(self):
+        return 'items' in getattr(self, '_prefetched_objects_cache', {})
+
     def calculate_total(self):
         """Calculate and update order totals."""
-        self.subtotal = sum(
-            item.get_total() for item in self.items.all()
-        )
+        if self._items_prefetched():
+            items = self.items.all()
+            self.subtotal = sum(item.get_total() for item in items)
+            self._items_count = sum(item.quantity for item in items)
+        else:
+            totals = self.items.aggregate(
+                subtotal=Sum(F('price') * F('quantity')),
+                count=Sum('quantity')
+            )
+            self.subtotal = totals['subtotal'] or 0
+            self._items_count = totals['count'] or 0
         self.total = self.subtotal + self.delivery_fee - self.bonus_used
         return self.total
 
     @property
     def items_count(self):
         """Return total number of items in order."""
-        return sum(item.quantity for item in self.items.all())
+        if not hasattr(self, '_items_count'):
+            if self._items_prefetched():
+                self._items_count = sum(item.quantity for item in self.items.all())
+            else:
+                self._items_count = self.items.aggregate(
+                    count=Sum('quantity')
+                )['count'] or 0
+        return self._items_count
 
 
 class OrderItem(models.Model):
@@ -207,10 +258,8 @@ class OrderItem(models.Model):
         max_length=200
     )
 
-    price = models.DecimalField(
+    price = models.BigIntegerField(
         'Цена за единицу',
-        max_digits=10,
-        decimal_places=0,
         help_text='Цена на момент заказа'
     )
 
@@ -235,5 +284,5 @@ class OrderItem(models.Model):
         if self.product and not self.product_name:
             self.product_name = self.product.name
         if self.product and not self.price:
-            self.price = self.product.price
+            self.price = int(self.product.price)
         super().save(*args, **kwargs)
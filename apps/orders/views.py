@@ -5,13 +5,16 @@ Order views for Suwi - checkout, order status, and history.
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import View, DetailView, ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.contrib import messages
 from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 
 from apps.cart.cart import Cart
 from apps.accounts.models import SavedAddress
-from .models import Order, OrderItem
+from .forms import CheckoutForm
+from .models import ORDER_CARD_FIELDS, Order, OrderItem
 
 
 class CheckoutView(LoginRequiredMixin, View):
@@ -50,35 +53,26 @@ class CheckoutView(LoginRequiredMixin, View):
             messages.warning(request, 'Ваша корзина пуста')
             return redirect('cart:detail')
 
-        # Get form data
-        latitude = request.POST.get('latitude')
-        longitude = request.POST.get('longitude')
-        address = request.POST.get('address', '').strip()
-        phone = request.POST.get('phone', '').strip()
-        comment = request.POST.get('comment', '').strip()
-        save_address = request.POST.get('save_address') == 'on'
-        address_name = request.POST.get('address_name', '').strip()
-
-        # Validate required fields
-        errors = []
-        if not latitude or not longitude:
-            errors.append('Пожалуйста, укажите точку доставки на карте')
-        if not address:
-            errors.append('Укажите адрес доставки')
-        if not phone:
-            errors.append('Укажите номер телефона')
-
-        if errors:
-            for error in errors:
+        form = CheckoutForm(request.POST)
+        if not form.is_valid():
+            for error in form.error_messages_list():
                 messages.error(request, error)
             return redirect('orders:checkout')
 
-        try:
-            latitude = float(latitude)
-            longitude = float(longitude)
-        except (ValueError, TypeError):
-            messages.error(request, 'Неверные координаты')
-            return redirect('orders:checkout')
+        data = form.cleaned_data
+        latitude = data['latitude']
+        longitude = data['longitude']
+        address = data['address']
+
+        # Load cart products once, before the transaction; products removed
+        # from the menu since they were added are dropped here
+        cart_items = list(cart)
+        if not cart_items:
+            messages.warning(request, 'Товары из корзины больше недоступны')
+            return redirect('cart:detail')
+
+        # Totals are known from the cart, so the order is inserted complete
+        subtotal = sum(item['total_price'] for item in cart_items)
 
         # Create order
         with transaction.atomic():
@@ -87,30 +81,31 @@ class CheckoutView(LoginRequiredMixin, View):
                 latitude=latitude,
                 longitude=longitude,
                 address=address,
-                phone=phone,
-                comment=comment,
+                phone=data['phone'],
+                comment=data['comment'],
                 status='new',
+                subtotal=subtotal,
+                # Delivery fee and bonuses are not applied at checkout
+                total=subtotal,
             )
 
             # Create order items from cart
-            for item in cart:
-                OrderItem.objects.create(
+            OrderItem.objects.bulk_create([
+                OrderItem(
                     order=order,
                     product=item['product'],
                     product_name=item['product'].name,
                     price=item['price'],
                     quantity=item['quantity'],
                 )
-
-            # Calculate totals
-            order.calculate_total()
-            order.save()
+                for item in cart_items
+            ])
 
             # Save address if requested
-            if save_address and address_name:
+            if data['save_address'] and data['address_name']:
                 SavedAddress.objects.create(
                     customer=request.user,
-                    name=address_name,
+                    name=data['address_name'],
                     address=address,
                     latitude=latitude,
                     longitude=longitude,
@@ -155,17 +150,27 @@ class OrderStatusView(LoginRequiredMixin, View):
     """
 
     def get(self, request, pk):
-        order = get_object_or_404(
-            Order,
+        # Polled often: read the two columns instead of a full Order
+        order = Order.objects.filter(
             pk=pk,
             customer=request.user
-        )
-
-        return JsonResponse({
-            'status': order.status,
-            'status_display': order.get_status_display(),
-            'updated_at': order.updated_at.isoformat(),
-        })
+        ).values('status', 'updated_at').first()
+        if order is None:
+            raise Http404('Заказ не найден')
+
+        # Unchanged orders answer 304 with no body; the browser revalidates
+        # the cached JSON on every poll
+        etag = quote_etag(f'{order["status"]}-{order["updated_at"].timestamp()}')
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = JsonResponse({
+                'status': order['status'],
+                'status_display': Order.STATUS_DISPLAY.get(order['status'], order['status']),
+                'updated_at': order['updated_at'].isoformat(),
+            })
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
 
 class OrderHistoryView(LoginRequiredMixin, ListView):
@@ -180,7 +185,7 @@ class OrderHistoryView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         return Order.objects.filter(
             customer=self.request.user
-        ).prefetch_related('items')
+        ).only(*ORDER_CARD_FIELDS).prefetch_related('items')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -204,7 +209,7 @@ class RepeatOrderView(LoginRequiredMixin, View):
 
         # Add all items from order to cart
         items_added = 0
-        for item in order.items.all():
+        for item in order.items.select_related('product'):
             if item.product and item.product.is_available:
                 cart.add(
                     product=item.product,
@@ -2,11 +2,14 @@
 Admin configuration for telegram_bot app.
 """
 
+import hashlib
+
 from django.contrib import admin
+from django.core.cache import cache
 from django.utils.safestring import mark_safe
 
 from .models import TelegramSettings
-from .services import TelegramBot
+from .services import bot
 
 
 @admin.register(TelegramSettings)
@@ -60,8 +63,12 @@ class TelegramSettingsAdmin(admin.ModelAdmin):
                 '<span style="color: #999;">Токен не настроен</span>'
             )
 
-        bot = TelegramBot()
-        result = bot._make_request('getMe')
+        # getMe blocks the page; reuse a recent answer for this token
+        cache_key = 'telegram_getme:' + hashlib.sha256(obj.bot_token.encode()).hexdigest()
+        result = cache.get(cache_key)
+        if result is None:
+            result = bot._make_request('getMe') or False
+            cache.set(cache_key, result, 30)
 
         if result:
             bot_name = result.get('username', 'Unknown')
@@ -78,5 +85,4 @@ class TelegramSettingsAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         """Clear cache when saving."""
         super().save_model(request, obj, form, change)
-        from django.core.cache import cache
         cache.delete('telegram_settings')
@@ -12,7 +12,10 @@ from django.utils import timezone
 from apps.orders.models import Order
 from apps.telegram_bot.models import TelegramSettings
 from apps.telegram_bot.services import (
-    TelegramBot,
+    CALLBACK_DATA_RE,
+    CALLBACK_ORDER_FIELDS,
+    STATUS_TRANSITIONS,
+    bot,
     update_order_notification,
     send_customer_notification,
     get_customer_status_message,
@@ -20,6 +23,15 @@ from apps.telegram_bot.services import (
 
 logger = logging.getLogger(__name__)
 
+# Callback answer text for each new status
+CALLBACK_STATUS_NAMES = {
+    'confirmed': 'подтверждён ✅',
+    'cooking': 'готовится 👨‍🍳',
+    'delivering': 'в доставке 🚗',
+    'delivered': 'доставлен ✔️',
+    'cancelled': 'отменён ❌',
+}
+
 
 class Command(BaseCommand):
     help = 'Run Telegram bot in polling mode (for local development)'
@@ -27,6 +39,8 @@ class Command(BaseCommand):
     def __init__(self):
         super().__init__()
         self.last_update_id = 0
+        # Keep-alive session: the polling loop reuses one TLS connection
+        self.session = requests.Session()
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('🤖 Запуск Telegram бота в режиме polling...'))
@@ -43,8 +57,10 @@ class Command(BaseCommand):
 
         while True:
             try:
-                self.poll_updates(settings.bot_token)
-                time.sleep(1)
+                # getUpdates already waits for updates server-side, so poll
+                # again right away and only back off when it failed
+                if not self.poll_updates(settings.bot_token):
+                    time.sleep(1)
             except KeyboardInterrupt:
                 self.stdout.write(self.style.WARNING('\n👋 Бот остановлен.'))
                 break
@@ -56,12 +72,12 @@ class Command(BaseCommand):
         """Delete webhook to enable polling."""
         url = f'https://api.telegram.org/bot{token}/deleteWebhook'
         try:
-            requests.post(url, timeout=10)
+            self.session.post(url, timeout=10)
         except:
             pass
 
     def poll_updates(self, token):
-        """Poll for new updates."""
+        """Poll for new updates. Returns False if the request failed."""
         url = f'https://api.telegram.org/bot{token}/getUpdates'
         params = {
             'offset': self.last_update_id + 1,
@@ -70,11 +86,11 @@ class Command(BaseCommand):
         }
 
         try:
-            response = requests.get(url, params=params, timeout=35)
+            response = self.session.get(url, params=params, timeout=35)
             data = response.json()
 
             if not data.get('ok'):
-                return
+                return False
 
             for update in data.get('result', []):
                 self.last_update_id = update['update_id']
@@ -84,6 +100,9 @@ class Command(BaseCommand):
             pass
         except requests.RequestException as e:
             logger.error(f'Polling error: {e}')
+            return False
+
+        return True
 
     def process_update(self, update):
         """Process a single update."""
@@ -94,7 +113,6 @@ class Command(BaseCommand):
 
     def process_callback(self, callback_query):
         """Process callback query from inline button."""
-        bot = TelegramBot()
         callback_id = callback_query['id']
         data = callback_query.get('data', '')
 
@@ -104,29 +122,23 @@ class Command(BaseCommand):
             bot.answer_callback(callback_id, 'Неизвестная команда')
             return
 
-        try:
-            parts = data.split('_')
-            order_id = int(parts[1])
-            new_status = parts[2]
-        except (IndexError, ValueError):
+        match = CALLBACK_DATA_RE.match(data)
+        if not match:
             bot.answer_callback(callback_id, 'Неверный формат данных')
             return
+        order_id, new_status = int(match[1]), match[2]
 
         try:
-            order = Order.objects.get(pk=order_id)
+            # Customer and items are read again by the notifications below
+            order = Order.objects.only(*CALLBACK_ORDER_FIELDS).select_related(
+                'customer'
+            ).prefetch_related('items').get(pk=order_id)
         except Order.DoesNotExist:
             bot.answer_callback(callback_id, 'Заказ не найден')
             return
 
         # Validate status transition
-        valid_transitions = {
-            'new': ['confirmed', 'cancelled'],
-            'confirmed': ['cooking', 'cancelled'],
-            'cooking': ['delivering', 'cancelled'],
-            'delivering': ['delivered', 'cancelled'],
-        }
-
-        if new_status not in valid_transitions.get(order.status, []):
+        if new_status not in STATUS_TRANSITIONS.get(order.status, ()):
             bot.answer_callback(
                 callback_id,
                 f'Невозможно изменить статус с "{order.get_status_display()}"',
@@ -137,13 +149,16 @@ class Command(BaseCommand):
         # Update order status
         old_status = order.get_status_display()
         order.status = new_status
+        update_fields = ['status', 'updated_at']
 
         if new_status == 'confirmed':
             order.confirmed_at = timezone.now()
+            update_fields.append('confirmed_at')
         elif new_status == 'delivered':
             order.delivered_at = timezone.now()
+            update_fields.append('delivered_at')
 
-        order.save()
+        order.save(update_fields=update_fields)
 
         # Update Telegram message
         update_order_notification(order)
@@ -154,15 +169,7 @@ class Command(BaseCommand):
             send_customer_notification(order, customer_message)
 
         # Answer callback
-        status_names = {
-            'confirmed': 'подтверждён ✅',
-            'cooking': 'готовится 👨‍🍳',
-            'delivering': 'в доставке 🚗',
-            'delivered': 'доставлен ✔️',
-            'cancelled': 'отменён ❌',
-        }
-
-        status_text = status_names.get(new_status, new_status)
+        status_text = CALLBACK_STATUS_NAMES.get(new_status, new_status)
         bot.answer_callback(callback_id, f'Заказ #{order.pk} {status_text}')
 
         self.stdout.write(
@@ -178,10 +185,7 @@ class Command(BaseCommand):
         self.stdout.write(f'💬 Сообщение от @{username}: {text}')
 
         if text.startswith('/start'):
-            bot = TelegramBot()
-            settings = TelegramSettings.load()
-
-            welcome_text = settings.welcome_message or (
+            welcome_text = bot.settings.welcome_message or (
                 '🍣 Добро пожаловать в Суши love! ❤️\n\n'
                 'Здесь вы будете получать уведомления о статусе ваших заказов.'
             )
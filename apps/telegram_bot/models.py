@@ -3,9 +3,16 @@ Telegram bot settings model for Suwi.
 Uses singleton pattern - only one settings instance allowed.
 """
 
+import time
+
 from django.db import models
 from django.core.cache import cache
 
+# Process-local copy of the settings in front of the shared cache, so hot
+# paths (polling loop, webhook) skip the cache backend round-trip
+LOCAL_CACHE_TIMEOUT = 30
+_local_cache = {'settings': None, 'loaded_at': 0.0}
+
 
 class TelegramSettings(models.Model):
     """
@@ -65,6 +72,7 @@ class TelegramSettings(models.Model):
         super().save(*args, **kwargs)
         # Clear cache when settings are updated
         cache.delete('telegram_settings')
+        _local_cache['settings'] = None
 
     def delete(self, *args, **kwargs):
         # Prevent deletion of singleton
@@ -76,6 +84,10 @@ class TelegramSettings(models.Model):
         Load settings from database or cache.
         Creates default instance if none exists.
         """
+        settings = _local_cache['settings']
+        if settings is not None and time.monotonic() - _local_cache['loaded_at'] < LOCAL_CACHE_TIMEOUT:
+            return settings
+
         # Try to get from cache first
         settings = cache.get('telegram_settings')
         if settings is None:
@@ -89,6 +101,9 @@ class TelegramSettings(models.Model):
             )
             # Cache for 5 minutes
             cache.set('telegram_settings', settings, 300)
+
+        _local_cache['settings'] = settings
+        _local_cache['loaded_at'] = time.monotonic()
         return settings
 
     @classmethod
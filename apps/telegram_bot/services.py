@@ -3,14 +3,74 @@ Telegram bot services for Suwi.
 Handles sending notifications and processing callbacks.
 """
 
+import re
+import json
+import time
+import hashlib
 import requests
 import logging
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .models import TelegramSettings
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts for Bot API calls
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Longest flood-control wait (retry_after, seconds) honoured inline
+MAX_RETRY_AFTER = 3
+
+# Only connection failures are retried: the request never reached
+# Telegram, so resending cannot duplicate a message
+CONNECT_RETRY = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+
+# Shared keep-alive session: status updates reuse pooled TLS connections
+# to api.telegram.org instead of a new handshake per call
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=20, max_retries=CONNECT_RETRY
+))
+
+# Inline button payload: order_{order_id}_{new_status}
+CALLBACK_DATA_RE = re.compile(r'^order_(\d+)_([a-z]+)$')
+
+# Statuses an order may move to from each status
+STATUS_TRANSITIONS = {
+    'new': ('confirmed', 'cancelled'),
+    'confirmed': ('cooking', 'cancelled'),
+    'cooking': ('delivering', 'cancelled'),
+    'delivering': ('delivered', 'cancelled'),
+}
+
+# Order columns read when handling a status button: the notification
+# text and keyboard, the customer's chat and the fields the save touches
+CALLBACK_ORDER_FIELDS = (
+    'id', 'customer__telegram_chat_id', 'status', 'address', 'phone',
+    'comment', 'latitude', 'longitude', 'total', 'created_at',
+    'confirmed_at', 'delivered_at', 'telegram_message_id',
+)
+
+# Inline status buttons for each active order: (label, new status)
+STATUS_BUTTONS = {
+    'new': (('✅ Подтвердить', 'confirmed'), ('❌ Отклонить', 'cancelled')),
+    'confirmed': (('👨‍🍳 Готовится', 'cooking'),),
+    'cooking': (('🚗 В доставке', 'delivering'),),
+    'delivering': (('✔️ Доставлен', 'delivered'),),
+}
+
+STATUS_EMOJI = {
+    'new': '🆕',
+    'confirmed': '✅',
+    'cooking': '👨‍🍳',
+    'delivering': '🚗',
+    'delivered': '✔️',
+    'cancelled': '❌',
+}
+
 
 class TelegramBot:
     """
@@ -19,8 +79,11 @@ class TelegramBot:
 
     API_URL = 'https://api.telegram.org/bot{token}/{method}'
 
-    def __init__(self):
-        self.settings = TelegramSettings.load()
+    @property
+    def settings(self):
+        # Read through the per-process settings cache on every access so a
+        # long-lived instance picks up changes made in the admin
+        return TelegramSettings.load()
 
     @property
     def token(self):
@@ -32,10 +95,14 @@ class TelegramBot:
 
     def is_enabled(self):
         """Check if bot is properly configured and enabled."""
+        if not settings.TELEGRAM_ENABLED:
+            return False
+
+        bot_settings = self.settings
         return (
-            self.settings.is_active and
-            self.token and
-            self.chat_id
+            bot_settings.is_active and
+            bot_settings.bot_token and
+            bot_settings.chat_id
         )
 
     def _make_request(self, method, data=None):
@@ -47,9 +114,16 @@ class TelegramBot:
         url = self.API_URL.format(token=self.token, method=method)
 
         try:
-            response = requests.post(url, json=data, timeout=10)
+            response = http_session.post(url, json=data, timeout=REQUEST_TIMEOUT)
             result = response.json()
 
+            # Flood control (429) means the call was not performed
+            retry_after = result.get('parameters', {}).get('retry_after')
+            if retry_after and retry_after <= MAX_RETRY_AFTER:
+                time.sleep(retry_after)
+                response = http_session.post(url, json=data, timeout=REQUEST_TIMEOUT)
+                result = response.json()
+
             if not result.get('ok'):
                 logger.error(f'Telegram API error: {result.get("description")}')
                 return None
@@ -100,82 +174,83 @@ class TelegramBot:
         return self._make_request('answerCallbackQuery', data)
 
 
+# Shared instance; settings are read through the model's cache
+bot = TelegramBot()
+
+
+ORDER_MESSAGE_TEMPLATE = (
+    "{emoji} <b>Заказ #{pk}</b> — {status}\n"
+    "\n"
+    "📍 <b>Адрес:</b> {address}\n"
+    "📱 <b>Телефон:</b> {phone}\n"
+    "\n"
+    "{items}\n"
+    "\n"
+    "💰 <b>Итого:</b> {total:,.0f} сум\n"
+)
+ORDER_ITEM_TEMPLATE = "🍣 {name} x{quantity} — {total:,.0f} сум"
+
+
 def get_order_message(order):
     """
     Generate formatted order message for Telegram.
     """
-    status_emoji = {
-        'new': '🆕',
-        'confirmed': '✅',
-        'cooking': '👨‍🍳',
-        'delivering': '🚗',
-        'delivered': '✔️',
-        'cancelled': '❌',
-    }
-
-    emoji = status_emoji.get(order.status, '📋')
+    emoji = STATUS_EMOJI.get(order.status, '📋')
     status_text = order.get_status_display()
 
-    # Order items
-    items_text = '\n'.join([
-        f"🍣 {item.product_name} x{item.quantity} — {item.get_total():,.0f} сум"
+    items_text = '\n'.join(
+        ORDER_ITEM_TEMPLATE.format(
+            name=item.product_name, quantity=item.quantity, total=item.get_total()
+        )
         for item in order.items.all()
-    ])
-
-    # Build message
-    message = f"""
-{emoji} <b>Заказ #{order.pk}</b> — {status_text}
-
-📍 <b>Адрес:</b> {order.address}
-📱 <b>Телефон:</b> {order.phone}
-
-{items_text}
+    )
 
-💰 <b>Итого:</b> {order.total:,.0f} сум
-"""
+    message = ORDER_MESSAGE_TEMPLATE.format_map({
+        'emoji': emoji,
+        'pk': order.pk,
+        'status': status_text,
+        'address': order.address,
+        'phone': order.phone,
+        'items': items_text,
+        'total': order.total,
+    })
 
     if order.comment:
         message += f"\n💬 <b>Комментарий:</b> {order.comment}"
 
     message += f"\n\n🕐 {order.created_at.strftime('%d.%m.%Y %H:%M')}"
 
-    return message.strip()
+    return message
 
 
 def get_order_keyboard(order):
     """
     Generate inline keyboard for order status management.
     """
-    buttons = []
-
-    if order.status == 'new':
-        buttons = [
-            [
-                {'text': '✅ Подтвердить', 'callback_data': f'order_{order.pk}_confirmed'},
-                {'text': '❌ Отклонить', 'callback_data': f'order_{order.pk}_cancelled'},
-            ]
-        ]
-    elif order.status == 'confirmed':
-        buttons = [
-            [{'text': '👨‍🍳 Готовится', 'callback_data': f'order_{order.pk}_cooking'}]
-        ]
-    elif order.status == 'cooking':
-        buttons = [
-            [{'text': '🚗 В доставке', 'callback_data': f'order_{order.pk}_delivering'}]
-        ]
-    elif order.status == 'delivering':
-        buttons = [
-            [{'text': '✔️ Доставлен', 'callback_data': f'order_{order.pk}_delivered'}]
-        ]
-
-    # Add maps buttons for active orders
-    if order.status in ['new', 'confirmed', 'cooking', 'delivering']:
-        buttons.append([
+    row = STATUS_BUTTONS.get(order.status)
+    if not row:
+        return None
+
+    return {'inline_keyboard': [
+        [
+            {'text': text, 'callback_data': f'order_{order.pk}_{status}'}
+            for text, status in row
+        ],
+        # Maps buttons for active orders
+        [
             {'text': '📍 Карта', 'url': order.get_yandex_maps_url()},
             {'text': '📦 Яндекс Go', 'url': order.get_yandex_go_url()},
-        ])
+        ],
+    ]}
+
+
+def _message_digest(text, keyboard):
+    payload = text + json.dumps(keyboard, sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
 
-    return {'inline_keyboard': buttons} if buttons else None
+def _message_digest_key(order):
+    return f'telegram_message_digest:{order.pk}'
 
 
 def send_order_notification(order):
@@ -183,8 +258,6 @@ def send_order_notification(order):
     Send order notification to restaurant chat.
     Returns message_id if successful.
     """
-    bot = TelegramBot()
-
     if not bot.is_enabled():
         logger.info('Telegram notifications disabled')
         return None
@@ -200,8 +273,9 @@ def send_order_notification(order):
 
     if result:
         # Save message_id for later updates
-        order.telegram_message_id = str(result.get('message_id', ''))
+        order.telegram_message_id = result.get('message_id')
         order.save(update_fields=['telegram_message_id'])
+        cache.set(_message_digest_key(order), _message_digest(message, keyboard), 86400)
         return result.get('message_id')
 
     return None
@@ -211,8 +285,6 @@ def update_order_notification(order):
     """
     Update existing order notification in Telegram.
     """
-    bot = TelegramBot()
-
     if not bot.is_enabled():
         return None
 
@@ -223,6 +295,12 @@ def update_order_notification(order):
     message = get_order_message(order)
     keyboard = get_order_keyboard(order)
 
+    # Telegram rejects edits that change nothing; skip the round-trip
+    digest = _message_digest(message, keyboard)
+    digest_key = _message_digest_key(order)
+    if cache.get(digest_key) == digest:
+        return None
+
     result = bot.edit_message(
         chat_id=bot.chat_id,
         message_id=order.telegram_message_id,
@@ -230,6 +308,9 @@ def update_order_notification(order):
         reply_markup=keyboard
     )
 
+    if result:
+        cache.set(digest_key, digest, 86400)
+
     return result
 
 
@@ -238,8 +319,6 @@ def send_customer_notification(order, message_text):
     Send notification to customer via Telegram.
     Customer must have telegram_chat_id set.
     """
-    bot = TelegramBot()
-
     if not bot.is_enabled():
         return None
 
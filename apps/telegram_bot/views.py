@@ -4,6 +4,7 @@ Telegram webhook views for Suwi.
 
 import json
 import logging
+from django.conf import settings
 from django.http import JsonResponse, HttpResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
@@ -11,9 +12,11 @@ from django.utils.decorators import method_decorator
 from django.utils import timezone
 
 from apps.orders.models import Order
-from .models import TelegramSettings
 from .services import (
-    TelegramBot,
+    CALLBACK_DATA_RE,
+    CALLBACK_ORDER_FIELDS,
+    STATUS_TRANSITIONS,
+    bot,
     update_order_notification,
     send_customer_notification,
     get_customer_status_message,
@@ -21,6 +24,28 @@ from .services import (
 
 logger = logging.getLogger(__name__)
 
+# Callback answer text for each new status
+CALLBACK_STATUS_NAMES = {
+    'confirmed': 'подтверждён',
+    'cooking': 'готовится',
+    'delivering': 'в доставке',
+    'delivered': 'доставлен',
+    'cancelled': 'отменён',
+}
+
+
+def callback_answer(callback_id, text, show_alert=False):
+    """
+    Build an answerCallbackQuery call to return as the webhook response.
+    Telegram performs it itself, saving an outbound request per update.
+    """
+    return {
+        'method': 'answerCallbackQuery',
+        'callback_query_id': callback_id,
+        'text': text,
+        'show_alert': show_alert,
+    }
+
 
 @method_decorator(csrf_exempt, name='dispatch')
 class WebhookView(View):
@@ -33,11 +58,12 @@ class WebhookView(View):
         """Process incoming webhook update."""
         try:
             data = json.loads(request.body)
-            logger.debug(f'Telegram webhook data: {data}')
+            logger.debug('Telegram webhook data: %s', data)
 
-            # Process callback query (button clicks)
+            # Process callback query (button clicks); the answer goes back
+            # in the response body instead of a separate API call
             if 'callback_query' in data:
-                self.process_callback(data['callback_query'])
+                return JsonResponse(self.process_callback(data['callback_query']))
 
             # Process regular messages (optional: for customer linking)
             elif 'message' in data:
@@ -57,56 +83,49 @@ class WebhookView(View):
         """
         Process callback query from inline button.
         Format: order_{order_id}_{new_status}
+        Returns the answerCallbackQuery payload for the webhook response.
         """
-        bot = TelegramBot()
         callback_id = callback_query['id']
         data = callback_query.get('data', '')
 
         # Parse callback data
         if not data.startswith('order_'):
-            bot.answer_callback(callback_id, 'Неизвестная команда')
-            return
+            return callback_answer(callback_id, 'Неизвестная команда')
 
-        try:
-            parts = data.split('_')
-            order_id = int(parts[1])
-            new_status = parts[2]
-        except (IndexError, ValueError):
-            bot.answer_callback(callback_id, 'Неверный формат данных')
-            return
+        match = CALLBACK_DATA_RE.match(data)
+        if not match:
+            return callback_answer(callback_id, 'Неверный формат данных')
+        order_id, new_status = int(match[1]), match[2]
 
         # Get order
         try:
-            order = Order.objects.get(pk=order_id)
+            # Customer and items are read again by the notifications below
+            order = Order.objects.only(*CALLBACK_ORDER_FIELDS).select_related(
+                'customer'
+            ).prefetch_related('items').get(pk=order_id)
         except Order.DoesNotExist:
-            bot.answer_callback(callback_id, 'Заказ не найден')
-            return
+            return callback_answer(callback_id, 'Заказ не найден')
 
         # Validate status transition
-        valid_transitions = {
-            'new': ['confirmed', 'cancelled'],
-            'confirmed': ['cooking', 'cancelled'],
-            'cooking': ['delivering', 'cancelled'],
-            'delivering': ['delivered', 'cancelled'],
-        }
-
-        if new_status not in valid_transitions.get(order.status, []):
-            bot.answer_callback(
+        if new_status not in STATUS_TRANSITIONS.get(order.status, ()):
+            return callback_answer(
                 callback_id,
                 f'Невозможно изменить статус с "{order.get_status_display()}"',
                 show_alert=True
             )
-            return
 
         # Update order status
         order.status = new_status
+        update_fields = ['status', 'updated_at']
 
         if new_status == 'confirmed':
             order.confirmed_at = timezone.now()
+            update_fields.append('confirmed_at')
         elif new_status == 'delivered':
             order.delivered_at = timezone.now()
+            update_fields.append('delivered_at')
 
-        order.save()
+        order.save(update_fields=update_fields)
 
         # Update Telegram message
         update_order_notification(order)
@@ -117,17 +136,9 @@ class WebhookView(View):
             send_customer_notification(order, customer_message)
 
         # Answer callback
-        status_names = {
-            'confirmed': 'подтверждён',
-            'cooking': 'готовится',
-            'delivering': 'в доставке',
-            'delivered': 'доставлен',
-            'cancelled': 'отменён',
-        }
-
-        bot.answer_callback(
+        return callback_answer(
             callback_id,
-            f'Заказ #{order.pk} {status_names.get(new_status, new_status)}!'
+            f'Заказ #{order.pk} {CALLBACK_STATUS_NAMES.get(new_status, new_status)}!'
         )
 
     def process_message(self, message):
@@ -155,8 +166,6 @@ class WebhookView(View):
         """Link customer's Telegram account for notifications."""
         from apps.accounts.models import Customer
 
-        bot = TelegramBot()
-
         try:
             customer = Customer.objects.get(pk=int(customer_id))
             customer.telegram_chat_id = str(chat_id)
@@ -177,10 +186,7 @@ class WebhookView(View):
 
     def send_welcome(self, chat_id):
         """Send welcome message to new user."""
-        bot = TelegramBot()
-        settings = TelegramSettings.load()
-
-        welcome_text = settings.welcome_message or (
+        welcome_text = bot.settings.welcome_message or (
             '🍣 Добро пожаловать в Suwi!\n\n'
             'Здесь вы будете получать уведомления о статусе ваших заказов.'
         )
@@ -196,9 +202,7 @@ class SetWebhookView(View):
 
     def get(self, request):
         """Set up webhook URL."""
-        settings = TelegramSettings.load()
-
-        if not settings.bot_token:
+        if not bot.token:
             return JsonResponse({
                 'success': False,
                 'error': 'Bot token not configured'
@@ -207,26 +211,16 @@ class SetWebhookView(View):
         # Build webhook URL
         webhook_url = request.build_absolute_uri('/telegram/webhook/')
 
-        # Set webhook via Telegram API
-        api_url = f'https://api.telegram.org/bot{settings.bot_token}/setWebhook'
-
-        import requests
-        try:
-            response = requests.post(api_url, json={
-                'url': webhook_url,
-                'allowed_updates': ['message', 'callback_query']
-            }, timeout=10)
-
-            result = response.json()
-
-            return JsonResponse({
-                'success': result.get('ok', False),
-                'webhook_url': webhook_url,
-                'result': result
-            })
-
-        except requests.RequestException as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            })
+        # Set webhook via Telegram API (errors are logged by the bot)
+        result = bot._make_request('setWebhook', {
+            'url': webhook_url,
+            'allowed_updates': ['message', 'callback_query'],
+            # Telegram defaults to 40, far more than our workers serve
+            'max_connections': settings.TELEGRAM_WEBHOOK_MAX_CONNECTIONS,
+        })
+
+        return JsonResponse({
+            'success': result is not None,
+            'webhook_url': webhook_url,
+            'result': result
+        })
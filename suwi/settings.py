@@ -33,6 +33,12 @@ DEBUG = os.environ.get('DJANGO_DEBUG', 'True').lower() == 'true'
 
 ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1,.railway.app').split(',')
 
+# Workers that never serve staff can run without the admin URLs
+ADMIN_ENABLED = os.environ.get('DJANGO_ADMIN_ENABLED', 'True').lower() == 'true'
+
+# Admin mount point; set a private prefix so edge rules can drop /admin/
+ADMIN_URL = os.environ.get('DJANGO_ADMIN_URL', 'admin').strip('/') + '/'
+
 # CSRF trusted origins for Railway
 CSRF_TRUSTED_ORIGINS = os.environ.get(
     'CSRF_TRUSTED_ORIGINS',
@@ -63,10 +69,12 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.menu.middleware.FavoriteIdsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -113,6 +121,10 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': 600,
+            # Wait for a concurrent writer instead of failing with
+            # "database is locked" during bursts of webhook updates
+            'OPTIONS': {'timeout': 20},
         }
     }
 
@@ -125,9 +137,11 @@ else:
 AUTH_USER_MODEL = 'accounts.Customer'
 
 # Authentication backends
+# PhoneBackend also handles the admin login (phone passed as username),
+# so ModelBackend is not listed: it would repeat the lookup and the
+# password hashing on every failed login.
 AUTHENTICATION_BACKENDS = [
     'apps.accounts.backends.PhoneBackend',
-    'django.contrib.auth.backends.ModelBackend',  # Fallback for admin
 ]
 
 # Password validation
@@ -218,6 +232,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN', '')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID', '')
 
+# Concurrent webhook connections Telegram may open, about two per worker
+TELEGRAM_WEBHOOK_MAX_CONNECTIONS = int(os.environ.get(
+    'TELEGRAM_WEBHOOK_MAX_CONNECTIONS',
+    2 * int(os.environ.get('WEB_CONCURRENCY', '1'))
+))
+
+# Deployment-wide kill switch; skips the settings lookup entirely when off
+TELEGRAM_ENABLED = os.environ.get('TELEGRAM_ENABLED', 'True').lower() == 'true'
+
 
 # =============================================================================
 # RESTAURANT SETTINGS
@@ -0,0 +1,47 @@
+"""
+Project-level views for Suwi.
+"""
+
+import hashlib
+from functools import lru_cache
+
+from django.http import HttpResponse, HttpResponseRedirect
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import etag, require_safe
+
+# How long browsers and CDNs may reuse the root redirect; kept short and
+# temporary so the target of "/" can still change
+HOME_REDIRECT_MAX_AGE = 60 * 5
+
+
+@lru_cache(maxsize=None)
+def _catalog_url():
+    # Fixed for the life of the process; reverse it once
+    return reverse('menu:catalog')
+
+
+@lru_cache(maxsize=None)
+def _offline_page():
+    # The page has no context, so render it once per process
+    return render_to_string('offline.html').encode()
+
+
+@lru_cache(maxsize=None)
+def _offline_page_etag():
+    return hashlib.md5(_offline_page(), usedforsecurity=False).hexdigest()
+
+
+def home(request):
+    """Redirect the site root to the menu catalog."""
+    response = HttpResponseRedirect(_catalog_url())
+    patch_cache_control(response, public=True, max_age=HOME_REDIRECT_MAX_AGE)
+    return response
+
+
+@require_safe
+@etag(lambda request: _offline_page_etag())
+def offline(request):
+    """Fallback page for the PWA when the network is unavailable."""
+    return HttpResponse(_offline_page())
@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'suwi.settings')
 
 application = get_wsgi_application()
+
+# Import every included URLconf and build the reverse lookup tables at
+# worker boot rather than on the first requests
+get_resolver()._populate()